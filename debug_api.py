@@ -5,32 +5,147 @@ Enhanced Debug script for Falling Fruit API
 Tests the improved MCP server functionality including:
 - Proper fruit type parsing with common_names/scientific_names
 - Client-side filtering since API doesn't filter by query
-- 24-hour caching for performance  
+- 24-hour caching for performance (in memory, plus an on-disk /types copy
+  under ~/.cache/falling_fruit for repeated debug runs)
 - Actual fruit type ID mapping for location filtering
 - Real apple type detection and location search
 
 Run: uv run python debug_api.py
 """
 
+import io
 import os
+import re
+import sys
+import time
 import asyncio
+from collections import defaultdict
+from contextvars import ContextVar
+from itertools import chain, islice
+from pathlib import Path
+from typing import Optional
+
 import httpx
+import orjson
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-async def test_falling_fruit_api():
+# Import our enhanced client
+from server import FallingFruitAPI
+
+# Apple-related names: apple(s), crab apple(s)/crabapple(s) and the Malus genus
+APPLE_RE = re.compile(r'\b(?:crab ?apples?|apples?|malus)\b', re.I)
+
+# On-disk copy of /types so repeated debug runs skip the large download
+TYPES_CACHE_FILE = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "falling_fruit" / "types.json"
+TYPES_CACHE_TTL = 24 * 60 * 60  # 24 hours, same as the server's in-memory cache
+
+# Verbose request/response header dumps, enabled with FF_DEBUG=1
+DEBUG = os.getenv("FF_DEBUG") == "1"
+
+# Most apple type IDs sent in one batched /locations request
+APPLE_BATCH_SIZE = 50
+
+# Cap on in-flight raw API requests while the checks run concurrently. A
+# non-numeric value falls back to the default, and anything below 1 would
+# block every request, so it is raised to 1.
+try:
+    FF_CONCURRENCY = max(1, int(os.getenv("FF_CONCURRENCY", "2")))
+except ValueError:
+    FF_CONCURRENCY = 2
+_request_slots = asyncio.Semaphore(FF_CONCURRENCY)
+
+# Per-check output buffer so concurrently running checks don't interleave
+_output: ContextVar[Optional[io.StringIO]] = ContextVar("output", default=None)
+
+def log(*args, **kwargs):
+    """print() into the current check's buffer, falling back to stdout"""
+    print(*args, file=_output.get() or sys.stdout, **kwargs)
+
+async def run_buffered(check, *args):
+    """Run a check with its output buffered, then flush it in one piece"""
+    buffer = io.StringIO()
+    _output.set(buffer)
+    try:
+        await check(*args)
+    finally:
+        print(buffer.getvalue(), end="", flush=True)
+
+async def _get(client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+    """GET through the shared client, waiting for a free request slot"""
+    async with _request_slots:
+        return await client.get(url, **kwargs)
+
+async def fetch_types_cached(client: httpx.AsyncClient, headers: dict) -> list:
+    """Get all fruit types, reusing the on-disk copy while it is fresh"""
+    try:
+        if TYPES_CACHE_FILE.stat().st_mtime > time.time() - TYPES_CACHE_TTL:
+            return orjson.loads(TYPES_CACHE_FILE.read_bytes())
+    except (OSError, ValueError):
+        pass  # Missing or unreadable cache, fetch a fresh copy
+    
+    response = await _get(client, "https://fallingfruit.org/api/0.3/types", headers=headers)
+    response.raise_for_status()
+    
+    try:
+        # Write to a temp file first so a concurrent reader never sees a partial cache
+        TYPES_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = TYPES_CACHE_FILE.with_suffix(".tmp")
+        tmp_file.write_bytes(response.content)
+        os.replace(tmp_file, TYPES_CACHE_FILE)
+    except OSError as e:
+        log(f"⚠️  Could not write types cache: {e}")
+    
+    return orjson.loads(response.content)
+
+def to_columns(all_types: list) -> tuple[list, list, list, list[str]]:
+    """Split raw /types dicts into parallel id, name and searchable-text columns"""
+    # The /types schema is stable: check its shape once instead of per element
+    if not isinstance(all_types, list) or (all_types and not isinstance(all_types[0], dict)):
+        raise ValueError("Unexpected /types payload: expected a list of objects")
+    
+    ids, common_columns, scientific_columns, haystacks = [], [], [], []
+    
+    for fruit_type in all_types:
+        common_names = []
+        for names in (fruit_type.get('common_names') or {}).values():
+            common_names.extend(names)
+        scientific_names = fruit_type.get('scientific_names') or []
+        
+        ids.append(fruit_type.get('id'))
+        common_columns.append(common_names)
+        scientific_columns.append(scientific_names)
+        # All names on separate lines, so one search covers them without matching across names
+        haystacks.append('\n'.join(chain(common_names, scientific_names)))
+    
+    return ids, common_columns, scientific_columns, haystacks
+
+def build_name_index(types) -> dict[str, list[int]]:
+    """Map each lower-cased word of a type's names to the ids of types using it"""
+    name_index = defaultdict(list)
+    for fruit_type in types:
+        tokens = {
+            token
+            for name in fruit_type.names_lower
+            for token in name.split()
+        }
+        for token in tokens:
+            name_index[token].append(fruit_type.id)
+    return name_index
+
+async def test_falling_fruit_api(client: httpx.AsyncClient):
     """Test the Falling Fruit API with direct HTTP calls"""
     
     api_key = os.getenv("FALLING_FRUIT_API_KEY")
     if not api_key:
-        print("❌ No FALLING_FRUIT_API_KEY found in environment")
-        print("Please set your API key:")
-        print("export FALLING_FRUIT_API_KEY='your_key_here'")
+        log("❌ No FALLING_FRUIT_API_KEY found in environment")
+        log("Please set your API key:")
+        log("export FALLING_FRUIT_API_KEY='your_key_here'")
         return
     
-    print(f"✅ API Key found: {api_key[:10]}...{api_key[-4:]}")
+    log(f"✅ API Key found: {api_key[:10]}...{api_key[-4:]}")
     
     # Test URL from your query
     test_url = "https://fallingfruit.org/api/0.3/locations"
@@ -40,172 +155,151 @@ async def test_falling_fruit_api():
         "photo": 0
     }
     
-    headers = {
-        "X-API-KEY": api_key,
-        "User-Agent": "falling-fruit-mcp-server"
-    }
+    headers = {"X-API-KEY": api_key}
     
-    print(f"\n🔍 Testing API call:")
-    print(f"URL: {test_url}")
-    print(f"Params: {params}")
-    print(f"Headers: {dict(headers)}")
+    log(f"\n🔍 Testing API call:")
+    log(f"URL: {test_url}")
+    log(f"Params: {params}")
+    if DEBUG:
+        log(f"Headers: {headers}")
     
     try:
-        async with httpx.AsyncClient() as client:
-            print(f"\n📡 Making request...")
-            response = await client.get(test_url, params=params, headers=headers, timeout=30.0)
-            
-            print(f"Status Code: {response.status_code}")
-            print(f"Response Headers: {dict(response.headers)}")
-            
-            if response.status_code == 200:
-                print("✅ Success!")
-                data = response.json()
-                print(f"Response type: {type(data)}")
-                print(f"Number of results: {len(data) if isinstance(data, list) else 'Not a list'}")
-                
-                if isinstance(data, list) and len(data) > 0:
-                    print(f"\nFirst result sample:")
-                    print(f"{data[0]}")
-                elif isinstance(data, dict):
-                    print(f"\nResponse data (dict):")
-                    for key, value in data.items():
-                        print(f"  {key}: {value}")
-                else:
-                    print(f"\nRaw response: {data}")
-                    
-            else:
-                print(f"❌ Request failed!")
-                print(f"Response body: {response.text}")
+        log(f"\n📡 Making request...")
+        response = await _get(client, test_url, params=params, headers=headers)
+        
+        log(f"Status Code: {response.status_code}")
+        if DEBUG:
+            log(f"Response Headers: {dict(response.headers)}")
+        
+        response.raise_for_status()
+        log("✅ Success!")
+        data = orjson.loads(response.content)
+        log(f"Response type: {type(data)}")
+        log(f"Number of results: {len(data) if isinstance(data, list) else 'Not a list'}")
+        
+        if isinstance(data, list) and len(data) > 0:
+            log(f"\nFirst result sample:")
+            log(f"{data[0]}")
+        elif isinstance(data, dict):
+            log(f"\nResponse data (dict):")
+            for key, value in data.items():
+                log(f"  {key}: {value}")
+        else:
+            log(f"\nRaw response: {data}")
                 
     except httpx.HTTPStatusError as e:
-        print(f"❌ HTTP Error: {e}")
-        print(f"Response: {e.response.text}")
+        log(f"❌ Request failed! HTTP Error: {e}")
+        log(f"Response: {e.response.text}")
     except httpx.RequestError as e:
-        print(f"❌ Request Error: {e}")
+        log(f"❌ Request Error: {e}")
     except Exception as e:
-        print(f"❌ Unexpected error: {e}")
+        log(f"❌ Unexpected error: {e}")
 
 
 
 
 
-async def test_find_actual_apples():
+async def test_find_actual_apples(client: httpx.AsyncClient):
     """Search through all types to find actual apple types"""
     
     api_key = os.getenv("FALLING_FRUIT_API_KEY")
     if not api_key:
-        print("❌ No API key for apple search test")
+        log("❌ No API key for apple search test")
         return
     
-    print(f"\n🍎 Searching for Actual Apple Types in Database")
-    print("=" * 50)
+    log(f"\n🍎 Searching for Actual Apple Types in Database")
+    log("=" * 50)
     
-    headers = {
-        "X-API-KEY": api_key,
-        "User-Agent": "falling-fruit-mcp-server"
-    }
+    headers = {"X-API-KEY": api_key}
     
-    async with httpx.AsyncClient() as client:
+    try:
+        # Get all types
         try:
-            # Get all types
-            response = await client.get(
-                "https://fallingfruit.org/api/0.3/types", 
-                headers=headers, 
-                timeout=30.0
-            )
-            
-            if response.status_code != 200:
-                print(f"❌ Failed to get types: {response.status_code}")
-                return
-                
-            all_types = response.json()
-            print(f"✅ Got {len(all_types)} total types, searching for apples...")
-            
-            # Search for apple-related types
-            apple_types = []
-            search_terms = ['apple', 'malus', 'crab apple', 'crabapple']
+            all_types = await fetch_types_cached(client, headers)
+        except httpx.HTTPStatusError as e:
+            log(f"❌ Failed to get types: {e.response.status_code}")
+            return
             
-            for fruit_type in all_types:
-                if not isinstance(fruit_type, dict):
+        log(f"✅ Got {len(all_types)} total types, searching for apples...")
+        
+        # Search for apple-related types, one regex search per type
+        ids, common_columns, scientific_columns, haystacks = to_columns(all_types)
+        apple_count = 0
+        apple_types = []  # Only the first APPLE_BATCH_SIZE matches are kept
+        
+        for row, haystack in enumerate(haystacks):
+            match = APPLE_RE.search(haystack)
+            if match:
+                apple_count += 1
+                if len(apple_types) >= APPLE_BATCH_SIZE:
                     continue
-                    
-                # Extract names for searching
-                common_names = []
-                scientific_names = []
-                
-                if 'common_names' in fruit_type and isinstance(fruit_type['common_names'], dict):
-                    for lang, names in fruit_type['common_names'].items():
-                        if isinstance(names, list):
-                            common_names.extend(names)
-                            
-                if 'scientific_names' in fruit_type and isinstance(fruit_type['scientific_names'], list):
-                    scientific_names.extend(fruit_type['scientific_names'])
-                
-                # Check if any names contain apple-related terms
-                all_names = common_names + scientific_names
-                for name in all_names:
-                    if isinstance(name, str):
-                        name_lower = name.lower()
-                        for term in search_terms:
-                            if term in name_lower:
-                                apple_types.append({
-                                    'id': fruit_type.get('id'),
-                                    'common_names': common_names,
-                                    'scientific_names': scientific_names,
-                                    'matched_name': name,
-                                    'matched_term': term
-                                })
-                                break
-                        if any(term in name_lower for term in search_terms):
-                            break
+                # Recover the full name (line) the match landed in
+                name_start = haystack.rfind('\n', 0, match.start()) + 1
+                name_end = haystack.find('\n', match.end())
+                apple_types.append({
+                    'id': ids[row],
+                    'common_names': common_columns[row],
+                    'scientific_names': scientific_columns[row],
+                    'matched_name': haystack[name_start:name_end] if name_end != -1 else haystack[name_start:],
+                    'matched_term': match.group(0).lower()
+                })
+        
+        log(f"🍎 Found {apple_count} apple-related types:")
+        
+        for i, apple_type in enumerate(islice(apple_types, 10)):  # Show first 10
+            log(f"  {i+1}. ID:{apple_type['id']} - {apple_type['matched_name']}")
+            if apple_type['common_names']:
+                log(f"     Common names: {apple_type['common_names'][:3]}")
+            if apple_type['scientific_names']:
+                log(f"     Scientific: {apple_type['scientific_names'][:2]}")
+            log()
+        
+        if apple_count > 10:
+            log(f"     ... and {apple_count - 10} more apple types")
             
-            print(f"🍎 Found {len(apple_types)} apple-related types:")
+        # Test all apple type IDs with one batched location search
+        if apple_types:
+            names_by_id = {t['id']: t['matched_name'] for t in apple_types}
+            log(f"\n🔍 Testing location search with {len(apple_types)} apple type IDs in one request:")
             
-            for i, apple_type in enumerate(apple_types[:10]):  # Show first 10
-                print(f"  {i+1}. ID:{apple_type['id']} - {apple_type['matched_name']}")
-                if apple_type['common_names']:
-                    print(f"     Common names: {apple_type['common_names'][:3]}")
-                if apple_type['scientific_names']:
-                    print(f"     Scientific: {apple_type['scientific_names'][:2]}")
-                print()
+            location_params = {
+                "center": "49.2772896,-123.1206219",  # 1001 Homer St
+                "types": ",".join(str(type_id) for type_id in names_by_id),
+                "limit": 10,
+                "photo": 0
+            }
             
-            if len(apple_types) > 10:
-                print(f"     ... and {len(apple_types) - 10} more apple types")
-                
-            # Test with a specific apple type ID
-            if apple_types:
-                test_apple = apple_types[0]
-                print(f"\n🔍 Testing location search with apple type ID {test_apple['id']}:")
-                
-                location_params = {
-                    "center": "49.2772896,-123.1206219",  # 1001 Homer St
-                    "types": str(test_apple['id']),
-                    "limit": 10,
-                    "photo": 0
-                }
+            loc_response = await _get(
+                client,
+                "https://fallingfruit.org/api/0.3/locations",
+                params=location_params,
+                headers=headers
+            )
+            
+            if loc_response.status_code == 200:
+                apple_locations = orjson.loads(loc_response.content)
+                log(f"  ✅ Found {len(apple_locations)} apple locations")
                 
-                loc_response = await client.get(
-                    "https://fallingfruit.org/api/0.3/locations",
-                    params=location_params,
-                    headers=headers,
-                    timeout=30.0
-                )
+                # Split the combined result back out per apple type
+                locations_by_type = defaultdict(list)
+                for loc in apple_locations:
+                    for type_id in loc.get('type_ids') or []:
+                        if type_id in names_by_id:
+                            locations_by_type[type_id].append(loc)
+                            
+                for type_id, locs in locations_by_type.items():
+                    log(f"  {names_by_id[type_id]} (ID:{type_id}): {len(locs)} locations")
+                if apple_locations:
+                    log(f"  First location: {apple_locations[0]}")
+            else:
+                log(f"  ❌ Location search failed: {loc_response.status_code}")
                 
-                if loc_response.status_code == 200:
-                    apple_locations = loc_response.json()
-                    print(f"  ✅ Found {len(apple_locations)} locations for {test_apple['matched_name']}")
-                    if apple_locations:
-                        print(f"  First location: {apple_locations[0]}")
-                else:
-                    print(f"  ❌ Location search failed: {loc_response.status_code}")
-                    
-        except Exception as e:
-            print(f"❌ Apple search error: {e}")
+    except Exception as e:
+        log(f"❌ Apple search error: {e}")
 
 
 
-async def test_without_auth():
+async def test_without_auth(client: httpx.AsyncClient):
     """Test without authentication to see what happens"""
     
     test_url = "https://fallingfruit.org/api/0.3/locations"
@@ -215,140 +309,155 @@ async def test_without_auth():
         "photo": 0
     }
     
-    print(f"\n🔍 Testing without authentication:")
+    log(f"\n🔍 Testing without authentication:")
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(test_url, params=params, timeout=30.0)
-            print(f"Status Code (no auth): {response.status_code}")
-            print(f"Response (no auth): {response.text[:200]}...")
+        # Only the head of the body is shown, so stop reading once we have it
+        async with _request_slots, client.stream("GET", test_url, params=params) as response:
+            log(f"Status Code (no auth): {response.status_code}")
+            head = b""
+            async for chunk in response.aiter_bytes():
+                head += chunk
+                if len(head) >= 200:
+                    break
+            log(f"Response (no auth): {head[:200].decode('utf-8', 'replace')}...")
                 
     except Exception as e:
-        print(f"❌ No auth test error: {e}")
+        log(f"❌ No auth test error: {e}")
 
-async def test_enhanced_api_client():
+async def test_enhanced_api_client(client: FallingFruitAPI):
     """Test our enhanced API client with caching and proper parsing"""
-    print(f"\n🚀 Testing Enhanced API Client")
-    print("=" * 50)
-    
-    # Import our enhanced client
-    import sys
-    sys.path.append('.')
-    from server import FallingFruitAPI
+    log(f"\n🚀 Testing Enhanced API Client")
+    log("=" * 50)
     
     try:
-        client = FallingFruitAPI()
-        
-        print("🔍 Testing get_all_types with caching...")
-        start_time = asyncio.get_event_loop().time()
+        log("🔍 Testing get_all_types with caching...")
+        start_time = time.perf_counter()
         all_types = await client.get_all_types()
-        first_call_time = asyncio.get_event_loop().time() - start_time
+        first_call_time = time.perf_counter() - start_time
         
-        print(f"  ✅ First call: {len(all_types)} types in {first_call_time:.2f}s")
+        log(f"  ✅ First call: {len(all_types)} types in {first_call_time:.2f}s")
         
         # Test caching
-        start_time = asyncio.get_event_loop().time()
+        start_time = time.perf_counter()
         cached_types = await client.get_all_types()
-        cached_call_time = asyncio.get_event_loop().time() - start_time
+        cached_call_time = time.perf_counter() - start_time
         
-        print(f"  ✅ Cached call: {len(cached_types)} types in {cached_call_time:.3f}s")
-        print(f"  🚀 Cache speedup: {first_call_time/cached_call_time:.1f}x faster")
+        log(f"  ✅ Cached call: {len(cached_types)} types in {cached_call_time:.3f}s")
+        log(f"  🚀 Cache speedup: {first_call_time / max(cached_call_time, 1e-9):.1f}x faster")
+        
+        # Index names once, then look types up by word instead of rescanning
+        name_index = build_name_index(all_types)
+        type_by_id = {t.id: t for t in all_types}
         
         # Show some actual parsed types
-        apple_types = [t for t in all_types if any('apple' in name.lower() for name in t.common_names + t.scientific_names)]
-        print(f"\n🍎 Found {len(apple_types)} apple types with proper parsing:")
+        apple_types = [type_by_id[type_id] for type_id in name_index.get('apple', [])]
+        log(f"\n🍎 Found {len(apple_types)} apple types with proper parsing:")
         
         for i, apple_type in enumerate(apple_types[:5]):
-            print(f"  {i+1}. ID:{apple_type.id} - {apple_type.name}")
-            print(f"     Common names: {apple_type.common_names[:3]}")
-            print(f"     Scientific: {apple_type.scientific_names[:2]}")
-            print()
+            log(f"  {i+1}. ID:{apple_type.id} - {apple_type.name}")
+            log(f"     Common names: {apple_type.common_names[:3]}")
+            log(f"     Scientific: {apple_type.scientific_names[:2]}")
+            log()
             
         # Test client-side filtering
-        print("🔍 Testing client-side filtering...")
+        log("🔍 Testing client-side filtering...")
         apple_search = await client.get_types("apple")
-        print(f"  ✅ Apple search: {len(apple_search)} results")
+        log(f"  ✅ Apple search: {len(apple_search)} results")
         
         cherry_search = await client.get_types("cherry")
-        print(f"  ✅ Cherry search: {len(cherry_search)} results")
+        log(f"  ✅ Cherry search: {len(cherry_search)} results")
         
         # Test exact name lookup
-        print("\n🎯 Testing find_fruit_type_by_name...")
+        log("\n🎯 Testing find_fruit_type_by_name...")
         apple_type = await client.find_fruit_type_by_name("apple")
         if apple_type:
-            print(f"  ✅ Found apple: ID:{apple_type.id} - {apple_type.name}")
+            log(f"  ✅ Found apple: ID:{apple_type.id} - {apple_type.name}")
         else:
-            print(f"  ❌ No apple type found")
+            log(f"  ❌ No apple type found")
             
         crabapple_type = await client.find_fruit_type_by_name("crabapple")
         if crabapple_type:
-            print(f"  ✅ Found crabapple: ID:{crabapple_type.id} - {crabapple_type.name}")
+            log(f"  ✅ Found crabapple: ID:{crabapple_type.id} - {crabapple_type.name}")
         else:
-            print(f"  ❌ No crabapple type found")
+            log(f"  ❌ No crabapple type found")
             
     except Exception as e:
-        print(f"❌ Enhanced API client test error: {e}")
+        log(f"❌ Enhanced API client test error: {e}")
 
-async def test_location_filtering():
+async def test_location_filtering(client: FallingFruitAPI):
     """Test if location search actually filters by type ID"""
-    print(f"\n🎯 Testing Location Filtering with Real Type IDs")
-    print("=" * 50)
-    
-    import sys
-    sys.path.append('.')
-    from server import FallingFruitAPI
+    log(f"\n🎯 Testing Location Filtering with Real Type IDs")
+    log("=" * 50)
     
     try:
-        client = FallingFruitAPI()
-        
         # Get some actual apple types
         apple_types = await client.get_types("apple")
         if not apple_types:
-            print("❌ No apple types found to test with")
+            log("❌ No apple types found to test with")
             return
             
         test_apple = apple_types[0]
-        print(f"🍎 Testing with apple type: ID:{test_apple.id} - {test_apple.name}")
+        log(f"🍎 Testing with apple type: ID:{test_apple.id} - {test_apple.name}")
         
         # Test location search without type filter
-        print(f"\n🔍 Location search WITHOUT type filter:")
+        log(f"\n🔍 Location search WITHOUT type filter:")
         all_locations = await client.get_locations(49.2772896, -123.1206219, radius_km=2, limit=10)
-        print(f"  ✅ Found {len(all_locations)} total locations")
+        log(f"  ✅ Found {len(all_locations)} total locations")
         
         # Test location search WITH type filter
-        print(f"\n🔍 Location search WITH apple type filter (ID:{test_apple.id}):")
+        log(f"\n🔍 Location search WITH apple type filter (ID:{test_apple.id}):")
         apple_locations = await client.get_locations(49.2772896, -123.1206219, radius_km=2, type_id=test_apple.id, limit=10)
-        print(f"  ✅ Found {len(apple_locations)} apple locations")
+        log(f"  ✅ Found {len(apple_locations)} apple locations")
         
         if len(apple_locations) < len(all_locations):
-            print(f"  🎉 Filtering works! {len(all_locations) - len(apple_locations)} locations filtered out")
+            log(f"  🎉 Filtering works! {len(all_locations) - len(apple_locations)} locations filtered out")
         elif len(apple_locations) == len(all_locations):
-            print(f"  ⚠️  Same number of results - filtering may not be working")
+            log(f"  ⚠️  Same number of results - filtering may not be working")
         
         # Show type IDs in results
         if apple_locations:
-            print(f"\n📊 Type IDs in filtered results:")
-            for i, loc in enumerate(apple_locations[:3]):
-                print(f"  Location {i+1}: type_ids = {loc.type_ids}")
+            log(f"\n📊 Type IDs in filtered results:")
+            for i, (loc, distance) in enumerate(apple_locations[:3]):
+                log(f"  Location {i+1} ({distance:.1f} km): type_ids = {loc.type_ids}")
                 if test_apple.id in loc.type_ids:
-                    print(f"    ✅ Contains our apple type ID {test_apple.id}")
+                    log(f"    ✅ Contains our apple type ID {test_apple.id}")
                 else:
-                    print(f"    ❌ Missing our apple type ID {test_apple.id}")
+                    log(f"    ❌ Missing our apple type ID {test_apple.id}")
                     
     except Exception as e:
-        print(f"❌ Location filtering test error: {e}")
+        log(f"❌ Location filtering test error: {e}")
+
+async def main():
+    """Run all debug checks over one shared HTTP connection pool"""
+    # HTTP/2 lets the concurrent checks multiplex over a single TLS connection
+    client = httpx.AsyncClient(
+        http2=True,
+        headers={"User-Agent": "falling-fruit-mcp-server"},
+        timeout=30.0,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=60.0)
+    )
+    # One enhanced client for both checks, so they share its types cache
+    api = FallingFruitAPI()
+    
+    try:
+        # The checks are independent, so overlap their network waits
+        await asyncio.gather(
+            # Test basic API connectivity
+            run_buffered(test_falling_fruit_api, client),
+            # Test our enhanced functionality
+            run_buffered(test_find_actual_apples, client),
+            run_buffered(test_enhanced_api_client, api),
+            run_buffered(test_location_filtering, api),
+            # Test edge cases
+            run_buffered(test_without_auth, client),
+        )
+    finally:
+        await api.aclose()
+        await client.aclose()
 
 if __name__ == "__main__":
     print("🚀 Falling Fruit API Debug Script - Enhanced Version")
     print("=" * 60)
     
-    # Test basic API connectivity
-    asyncio.run(test_falling_fruit_api())
-    
-    # Test our enhanced functionality  
-    asyncio.run(test_find_actual_apples())
-    asyncio.run(test_enhanced_api_client())
-    asyncio.run(test_location_filtering())
-    
-    # Test edge cases
-    asyncio.run(test_without_auth())
+    asyncio.run(main())
@@ -6,11 +6,16 @@ This server provides tools to interact with the Falling Fruit API,
 allowing users to discover fruit trees and foraging opportunities.
 """
 
+import asyncio
 import os
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from math import cos, radians, sin, asin, sqrt
-from typing import Optional, Dict, List, Any
-from urllib.parse import urlencode
+from itertools import chain
+from math import cos, degrees, pi, radians, sin, asin, sqrt
+from typing import Optional, Dict, Any, Sequence
 
 # Load environment variables from .env file
 try:
@@ -20,42 +25,70 @@ except ImportError:
     pass
 
 import httpx
+import orjson
 from fastmcp import FastMCP
-from geopy.geocoders import Nominatim
-from pydantic import BaseModel
 
 # Falling Fruit API base URL
 API_BASE_URL = "https://fallingfruit.org/api/0.3"
 
+# Earth's radius in kilometers, for Haversine distances
+EARTH_RADIUS_KM = 6371
+
 # API key from environment variable
 API_KEY = os.getenv("FALLING_FRUIT_API_KEY")
 if API_KEY == "":  # Treat empty string as None
     API_KEY = None
 
-# Geocoder for location resolution
-geolocator = Nominatim(user_agent="falling-fruit-mcp-server")
+# Nominatim search endpoint for location resolution
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Close the shared connection pools when the server shuts down"""
+    try:
+        yield
+    finally:
+        await api_client.aclose()
+        await LocationHelper.aclose()
 
 # Create FastMCP server
-mcp = FastMCP("Falling Fruit MCP Server")
+mcp = FastMCP("Falling Fruit MCP Server", lifespan=lifespan)
 
-class FruitLocation(BaseModel):
+def _haversine_term(lat1_rad: float, lng1_rad: float, cos_lat1: float, lat2: float, lng2: float) -> float:
+    """Calculate the Haversine 'a' term, which grows with distance, from a center given in radians"""
+    lat2, lng2 = radians(lat2), radians(lng2)
+    return sin((lat2 - lat1_rad) / 2) ** 2 + cos_lat1 * cos(lat2) * sin((lng2 - lng1_rad) / 2) ** 2
+
+@dataclass(slots=True, frozen=True)
+class FruitLocation:
     """Represents a fruit tree location from the API"""
     id: int
     lat: float
     lng: float
-    type_ids: list[int] = []
+    type_ids: tuple[int, ...] = ()
     description: str = ""
     access: int = 0
     season_start: Optional[int] = None
     season_stop: Optional[int] = None
 
-class FruitType(BaseModel):
+@dataclass(slots=True, frozen=True)
+class FruitType:
     """Represents a fruit type from the API"""
     id: int
     name: str
     scientific_name: str = ""
-    common_names: List[str] = []
-    scientific_names: List[str] = []
+    common_names: tuple[str, ...] = ()
+    scientific_names: tuple[str, ...] = ()
+    # Lower-cased common + scientific names, computed once for searching
+    _names_lower: tuple[str, ...] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, "_names_lower", tuple(name.lower() for name in chain(self.common_names, self.scientific_names)))
+    
+    @property
+    def names_lower(self) -> tuple[str, ...]:
+        """Lower-cased common and scientific names, for case-insensitive matching"""
+        return self._names_lower
 
 class FallingFruitAPI:
     """Client for interacting with the Falling Fruit API"""
@@ -63,12 +96,39 @@ class FallingFruitAPI:
     def __init__(self):
         self.base_url = API_BASE_URL
         self.api_key = API_KEY
-        self._types_cache = None
+        self._types_cache: Optional[tuple[FruitType, ...]] = None
         self._cache_timestamp = None
         self._cache_duration = timedelta(hours=24)  # Cache for 24 hours
+        self._types_lock = asyncio.Lock()  # Lets one caller refetch while the others wait
+        self._client: Optional[httpx.AsyncClient] = None
+        # Name lookups over the cached types, rebuilt whenever the cache refreshes
+        self._exact_index: dict[str, FruitType] = {}
+        self._name_entries: list[tuple[str, FruitType]] = []
+        # id -> name / scientific name maps for labelling locations
+        self._type_names: dict[int, str] = {}
+        self._type_scientific: dict[int, str] = {}
+        
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use"""
+        # Created lazily so it binds to the event loop that uses it, then reused
+        # so requests after the first skip the TCP+TLS handshake
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"X-API-KEY": self.api_key} if self.api_key else {},
+                timeout=10.0,
+                limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=30)
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Close the shared HTTP client, if one was created"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
         
-    async def get_locations(self, lat: float, lng: float, radius_km: int = 10, type_id: Optional[int] = None, limit: int = 100) -> list[FruitLocation]:
-        """Get fruit locations near a given coordinate"""
+    async def get_locations(self, lat: float, lng: float, radius_km: int = 10, type_id: Optional[int] = None, limit: int = 100) -> list[tuple[FruitLocation, float]]:
+        """Get fruit locations near a given coordinate, each paired with its distance in kilometers"""
         if not self.api_key:
             raise ValueError("Falling Fruit API key is not set. Please set the FALLING_FRUIT_API_KEY environment variable.")
             
@@ -81,82 +141,140 @@ class FallingFruitAPI:
         if type_id:
             params["types"] = type_id
             
-        headers = {"X-API-KEY": self.api_key}
+        # Center quantities shared by the bounding box and every distance below
+        lat_rad, lng_rad = radians(lat), radians(lng)
+        cos_lat = cos(lat_rad)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{self.base_url}/locations", params=params, headers=headers, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
+        if radius_km:
+            # Let the server drop locations outside the radius' bounding box
+            bounds = self._bounding_box(lat, lng, cos_lat, radius_km)
+            if bounds is not None:
+                params["bounds"] = bounds
             
-            locations = []
-            for item in data:
-                try:
-                    location = FruitLocation(**item)
-                    # Filter by distance if specified
-                    if radius_km and self._calculate_distance(lat, lng, location.lat, location.lng) <= radius_km:
-                        locations.append(location)
-                except Exception as e:
-                    continue
-                    
-            return locations[:limit]
+        response = await self._get_client().get("/locations", params=params)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        
+        locations = []
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            try:
+                # The API shape is known, so skip full validation and only
+                # coerce the fields the distance math and formatting depend on
+                season_start, season_stop = item.get("season_start"), item.get("season_stop")
+                locations.append(FruitLocation(
+                    id=int(item["id"]),
+                    lat=float(item["lat"]),
+                    lng=float(item["lng"]),
+                    type_ids=tuple(item.get("type_ids") or ()),
+                    description=item.get("description") or "",
+                    access=int(item.get("access") or 0),
+                    season_start=int(season_start) if season_start is not None else None,
+                    season_stop=int(season_stop) if season_stop is not None else None
+                ))
+            except (KeyError, TypeError, ValueError):
+                continue  # One malformed location shouldn't fail the whole search
+                
+        # Filter by distance if specified. Raw Haversine terms are compared against
+        # the radius' equivalent term (they never exceed 1), so only the locations
+        # kept need finishing into kilometers.
+        max_term = sin(min(radius_km / (2 * EARTH_RADIUS_KM), pi / 2)) ** 2 if radius_km else 1.0
+        terms = [_haversine_term(lat_rad, lng_rad, cos_lat, loc.lat, loc.lng) for loc in locations]
+        nearby = [(loc, term) for loc, term in zip(locations, terms) if term <= max_term]
+                
+        return [(loc, EARTH_RADIUS_KM * 2 * asin(sqrt(term))) for loc, term in nearby[:limit]]
     
 
     
-    async def get_all_types(self) -> list[FruitType]:
+    def _cached_types(self, now: datetime) -> Optional[tuple[FruitType, ...]]:
+        """Get the cached fruit types if they are still fresh"""
+        if (self._types_cache is not None and 
+            self._cache_timestamp is not None and 
+            now - self._cache_timestamp < self._cache_duration):
+            return self._types_cache
+        return None
+    
+    async def get_all_types(self) -> tuple[FruitType, ...]:
         """Get all fruit types with caching"""
         if not self.api_key:
             raise ValueError("Falling Fruit API key is not set. Please set the FALLING_FRUIT_API_KEY environment variable.")
             
         # Check cache
-        now = datetime.now()
-        if (self._types_cache is not None and 
-            self._cache_timestamp is not None and 
-            now - self._cache_timestamp < self._cache_duration):
-            return self._types_cache
+        cached = self._cached_types(datetime.now())
+        if cached is not None:
+            return cached
             
-        headers = {"X-API-KEY": self.api_key}
+        async with self._types_lock:
+            # Another caller may have refreshed the cache while we waited
+            now = datetime.now()
+            cached = self._cached_types(now)
+            if cached is not None:
+                return cached
+            return await self._fetch_all_types(now)
+    
+    async def _fetch_all_types(self, now: datetime) -> tuple[FruitType, ...]:
+        """Fetch all fruit types from the API and refresh the cache"""
+        response = await self._get_client().get("/types", timeout=30.0)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{self.base_url}/types", headers=headers, timeout=30.0)
-            response.raise_for_status()
-            data = response.json()
+        types = []
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            # Parse the complex structure from the API, ignoring containers of the wrong shape
+            common_names = []
+            item_common = item.get("common_names")
+            if isinstance(item_common, dict):
+                for names in item_common.values():
+                    if isinstance(names, list):
+                        common_names.extend(names)
+            item_scientific = item.get("scientific_names")
+            scientific_names = item_scientific if isinstance(item_scientific, list) else []
             
-            types = []
-            for item in data:
-                try:
-                    # Parse the complex structure from the API
-                    common_names = []
-                    scientific_names = []
-                    
-                    if 'common_names' in item and isinstance(item['common_names'], dict):
-                        for lang, names in item['common_names'].items():
-                            if isinstance(names, list):
-                                common_names.extend(names)
-                                
-                    if 'scientific_names' in item and isinstance(item['scientific_names'], list):
-                        scientific_names.extend(item['scientific_names'])
-                    
-                    # Use first common name as primary name, fallback to scientific
-                    primary_name = common_names[0] if common_names else (scientific_names[0] if scientific_names else "Unknown")
-                    primary_scientific = scientific_names[0] if scientific_names else ""
-                    
-                    fruit_type = FruitType(
-                        id=item['id'],
-                        name=primary_name,
-                        scientific_name=primary_scientific,
-                        common_names=common_names,
-                        scientific_names=scientific_names
-                    )
-                    types.append(fruit_type)
-                except Exception as e:
-                    continue
-                    
-            # Cache the results
-            self._types_cache = types
-            self._cache_timestamp = now
-            return types
+            # Use first common name as primary name, fallback to scientific
+            primary_name = common_names[0] if common_names else (scientific_names[0] if scientific_names else "Unknown")
+            primary_scientific = scientific_names[0] if scientific_names else ""
+            
+            try:
+                fruit_type = FruitType(
+                    id=int(item["id"]),
+                    name=primary_name,
+                    scientific_name=primary_scientific,
+                    common_names=tuple(common_names),
+                    scientific_names=tuple(scientific_names)
+                )
+            except (KeyError, TypeError, ValueError, AttributeError):
+                # Missing or non-numeric id, or a non-string name that can't be lower-cased
+                continue
+            types.append(fruit_type)
+                
+        # Cache the results
+        self._types_cache = tuple(types)
+        self._cache_timestamp = now
+        self._build_name_indexes(self._types_cache)
+        self._type_names = {t.id: t.name for t in self._types_cache}
+        self._type_scientific = {t.id: t.scientific_name for t in self._types_cache}
+        return self._types_cache
+    
+    def _build_name_indexes(self, types: Sequence[FruitType]):
+        """Index every lower-cased type name for exact and substring lookups"""
+        exact_index = {}
+        name_entries = []
+        for fruit_type in types:
+            for name_lower in fruit_type.names_lower:
+                exact_index.setdefault(name_lower, fruit_type)  # First type wins, as in a linear scan
+                name_entries.append((name_lower, fruit_type))
+        self._exact_index = exact_index
+        self._name_entries = name_entries
 
-    async def get_types(self, query: Optional[str] = None) -> list[FruitType]:
+    async def get_type_name_maps(self) -> tuple[dict[int, str], dict[int, str]]:
+        """Get id -> name and id -> scientific name maps for all fruit types"""
+        await self.get_all_types()
+        return self._type_names, self._type_scientific
+
+    async def get_types(self, query: Optional[str] = None) -> Sequence[FruitType]:
         """Get fruit types, filtered by query (client-side filtering)"""
         all_types = await self.get_all_types()
         
@@ -165,69 +283,121 @@ class FallingFruitAPI:
             
         query_lower = query.lower()
         filtered_types = []
+        seen_ids = set()
         
-        for fruit_type in all_types:
+        for name, fruit_type in self._name_entries:
             # Check if query matches any name
-            all_names = fruit_type.common_names + fruit_type.scientific_names
-            for name in all_names:
-                if query_lower in name.lower():
-                    filtered_types.append(fruit_type)
-                    break
+            if query_lower in name and fruit_type.id not in seen_ids:
+                seen_ids.add(fruit_type.id)
+                filtered_types.append(fruit_type)
                     
         return filtered_types
 
     async def find_fruit_type_by_name(self, name: str) -> Optional[FruitType]:
         """Find a fruit type by exact or partial name match"""
-        all_types = await self.get_all_types()
+        await self.get_all_types()
         name_lower = name.lower()
         
         # First try exact matches
-        for fruit_type in all_types:
-            all_names = fruit_type.common_names + fruit_type.scientific_names
-            for type_name in all_names:
-                if type_name.lower() == name_lower:
-                    return fruit_type
+        fruit_type = self._exact_index.get(name_lower)
+        if fruit_type is not None:
+            return fruit_type
         
         # Then try partial matches
-        for fruit_type in all_types:
-            all_names = fruit_type.common_names + fruit_type.scientific_names
-            for type_name in all_names:
-                if name_lower in type_name.lower():
-                    return fruit_type
+        for type_name, fruit_type in self._name_entries:
+            if name_lower in type_name:
+                return fruit_type
                     
         return None
     
-
-    
-    def _calculate_distance(self, lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-        """Calculate distance between two points in kilometers using Haversine formula"""
-        R = 6371  # Earth's radius in kilometers
-        
-        lat1, lng1, lat2, lng2 = map(radians, [lat1, lng1, lat2, lng2])
-        dlat = lat2 - lat1
-        dlng = lng2 - lng1
+    def _bounding_box(self, lat: float, lng: float, cos_lat: float, radius_km: float) -> Optional[str]:
+        """Get the 'south,west|north,east' box enclosing a radius around a point
         
-        a = (
-            sin(dlat / 2) ** 2 +
-            cos(lat1) * cos(lat2) * sin(dlng / 2) ** 2
-        )
-        c = 2 * asin(sqrt(a))
-        
-        return R * c
+        Returns None when the circle reaches a pole or crosses the antimeridian,
+        where a single box can't enclose it.
+        """
+        angle = radius_km / EARTH_RADIUS_KM  # Angular radius, matching the Haversine filter
+        if sin(angle) >= cos_lat:
+            return None  # The circle contains a pole
+        # The circle's widest longitude is reached away from the center's latitude,
+        # hence asin rather than a plain division by cos(lat). The small margin keeps
+        # edge locations inside once the box is rounded for the query string.
+        dlat = degrees(angle) * 1.01
+        dlng = degrees(asin(sin(angle) / cos_lat)) * 1.01
+        south, north = lat - dlat, lat + dlat
+        west, east = lng - dlng, lng + dlng
+        if south < -90.0 or north > 90.0 or west < -180.0 or east > 180.0:
+            return None
+        return f"{south:.6f},{west:.6f}|{north:.6f},{east:.6f}"
 
 class LocationHelper:
     """Helper for geocoding and location operations"""
     
-    @staticmethod
-    async def geocode_location(location: str) -> Optional[tuple[float, float]]:
+    _client: Optional[httpx.AsyncClient] = None
+    _cache: "OrderedDict[str, Optional[tuple[float, float]]]" = OrderedDict()
+    _cache_size = 256
+    # Nominatim's usage policy allows at most one request per second
+    _rate_limit = asyncio.Semaphore(1)
+    _last_request = 0.0
+    
+    @classmethod
+    def _get_client(cls) -> httpx.AsyncClient:
+        """Get the shared Nominatim HTTP client, creating it on first use"""
+        if cls._client is None or cls._client.is_closed:
+            cls._client = httpx.AsyncClient(
+                headers={"User-Agent": "falling-fruit-mcp-server"},
+                timeout=10.0
+            )
+        return cls._client
+    
+    @classmethod
+    async def aclose(cls):
+        """Close the shared Nominatim HTTP client, if one was created"""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+    
+    @classmethod
+    async def geocode_location(cls, location: str) -> Optional[tuple[float, float]]:
         """Convert location string to lat/lng coordinates"""
+        key = location.strip().lower()
+        if key in cls._cache:
+            cls._cache.move_to_end(key)
+            return cls._cache[key]
+            
         try:
-            geo_result = geolocator.geocode(location, timeout=10)
-            if geo_result:
-                return (geo_result.latitude, geo_result.longitude)
+            async with cls._rate_limit:
+                # Another caller may have resolved the same location while we waited
+                if key in cls._cache:
+                    return cls._cache[key]
+                    
+                wait = cls._last_request + 1.0 - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                try:
+                    response = await cls._get_client().get(
+                        NOMINATIM_URL,
+                        params={"q": location, "format": "json", "limit": 1}
+                    )
+                finally:
+                    cls._last_request = time.monotonic()
+                response.raise_for_status()
+                results = orjson.loads(response.content)
+                coordinates = (float(results[0]["lat"]), float(results[0]["lon"])) if results else None
         except Exception as e:
             print(f"Geocoding error: {e}")
-        return None
+            return None
+            
+        # Only successful lookups are cached, so transient errors get retried
+        cls._cache[key] = coordinates
+        if len(cls._cache) > cls._cache_size:
+            cls._cache.popitem(last=False)
+        return coordinates
+
+# Google Maps URL templates, bound once. Coordinates are clipped to 6 decimals
+# (~11 cm), which is plenty for a pin and keeps the links short.
+_MAPS_FMT = "https://www.google.com/maps/search/?api=1&query={:.6f},{:.6f}".format
+_DIR_FMT = "https://www.google.com/maps/dir/{:.6f},{:.6f}/{:.6f},{:.6f}".format
 
 class MapsHelper:
     """Helper for generating Google Maps links"""
@@ -236,23 +406,30 @@ class MapsHelper:
     def generate_maps_link(lat: float, lng: float, label: Optional[str] = None) -> str:
         """Generate a Google Maps link for the given coordinates with a pin marker"""
         # Always use coordinates directly with pin to avoid search confusion
-        return f"https://www.google.com/maps/search/?api=1&query={lat},{lng}"
+        return _MAPS_FMT(lat, lng)
     
     @staticmethod
     def generate_directions_link(origin_lat: float, origin_lng: float, dest_lat: float, dest_lng: float) -> str:
         """Generate a Google Maps directions link from origin to destination"""
-        return f"https://www.google.com/maps/dir/{origin_lat},{origin_lng}/{dest_lat},{dest_lng}"
+        return _DIR_FMT(origin_lat, origin_lng, dest_lat, dest_lng)
+
+# Short month names, indexed by month number - 1
+_MONTHS = (
+    "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+    "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"
+)
 
 class SeasonHelper:
     """Helper for season-related operations"""
     
     @staticmethod
-    def is_in_season(season_start: Optional[int], season_stop: Optional[int]) -> bool:
-        """Check if current month is within the fruit season"""
+    def is_in_season(season_start: Optional[int], season_stop: Optional[int], current_month: Optional[int] = None) -> bool:
+        """Check if current month (or the given one) is within the fruit season"""
         if season_start is None or season_stop is None:
             return True  # If no season info, assume always available
         
-        current_month = datetime.now().month
+        if current_month is None:
+            current_month = datetime.now().month
         
         if season_start <= season_stop:
             return season_start <= current_month <= season_stop
@@ -266,21 +443,23 @@ class SeasonHelper:
         if season_start is None or season_stop is None:
             return "Season unknown"
         
-        months = [
-            "Jan", "Feb", "Mar", "Apr", "May", "Jun",
-            "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"
-        ]
-        
         if season_start == season_stop:
-            return f"{months[season_start - 1]}"
+            return f"{_MONTHS[season_start - 1]}"
         elif season_start < season_stop:
-            return f"{months[season_start - 1]} - {months[season_stop - 1]}"
+            return f"{_MONTHS[season_start - 1]} - {_MONTHS[season_stop - 1]}"
         else:
-            return f"{months[season_start - 1]} - {months[season_stop - 1]} (next year)"
+            return f"{_MONTHS[season_start - 1]} - {_MONTHS[season_stop - 1]} (next year)"
+
+# Location access levels, indexed by the API's access code
+_ACCESS_LEVELS = ("unknown", "public", "permission_needed", "private")
 
 # Initialize API client
 api_client = FallingFruitAPI()
 
+async def _no_types() -> list[FruitType]:
+    """Stand-in for a type lookup when no fruit type was requested"""
+    return []
+
 @mcp.tool
 async def search_fruit_locations(location: str, fruit_type: Optional[str] = None, radius_km: int = 10) -> Dict[str, Any]:
     """
@@ -291,8 +470,11 @@ async def search_fruit_locations(location: str, fruit_type: Optional[str] = None
         fruit_type: Optional type of fruit to search for (e.g., 'apple', 'blackberry', 'cherry')
         radius_km: Search radius in kilometers (default: 10)
     """
-    # Geocode the location
-    geo_result = await LocationHelper.geocode_location(location)
+    # Geocode the location and look up the fruit type concurrently
+    geo_result, types = await asyncio.gather(
+        LocationHelper.geocode_location(location),
+        api_client.get_types(fruit_type) if fruit_type else _no_types()
+    )
     if not geo_result:
         return {
             "success": False,
@@ -306,7 +488,6 @@ async def search_fruit_locations(location: str, fruit_type: Optional[str] = None
     type_id = None
     fruit_type_info = None
     if fruit_type:
-        types = await api_client.get_types(fruit_type)
         if types:
             type_id = types[0].id
             fruit_type_info = {
@@ -330,14 +511,13 @@ async def search_fruit_locations(location: str, fruit_type: Optional[str] = None
         }
     
     # Format results
-    access_levels = {0: "unknown", 1: "public", 2: "permission_needed", 3: "private"}
+    current_month = datetime.now().month
     
     result_locations = []
-    for loc in locations:
-        distance = api_client._calculate_distance(lat, lng, loc.lat, loc.lng)
+    for loc, distance in locations:
         season = SeasonHelper.format_season(loc.season_start, loc.season_stop)
-        access = access_levels.get(loc.access, "unknown")
-        in_season = SeasonHelper.is_in_season(loc.season_start, loc.season_stop)
+        access = _ACCESS_LEVELS[loc.access] if 0 <= loc.access < len(_ACCESS_LEVELS) else "unknown"
+        in_season = SeasonHelper.is_in_season(loc.season_start, loc.season_stop, current_month)
         
         maps_link = MapsHelper.generate_maps_link(loc.lat, loc.lng)
         
@@ -389,11 +569,12 @@ async def get_seasonal_fruits(location: str, radius_km: int = 10) -> Dict[str, A
     
     # Get all locations
     locations = await api_client.get_locations(lat, lng, radius_km, limit=100)
+    now = datetime.now()
     
     # Filter to only in-season fruits
     seasonal_locations = [
-        loc for loc in locations 
-        if SeasonHelper.is_in_season(loc.season_start, loc.season_stop)
+        (loc, distance) for loc, distance in locations 
+        if SeasonHelper.is_in_season(loc.season_start, loc.season_stop, now.month)
     ]
     
     if not seasonal_locations:
@@ -402,24 +583,20 @@ async def get_seasonal_fruits(location: str, radius_km: int = 10) -> Dict[str, A
             "location": location,
             "search_center": {"lat": lat, "lng": lng},
             "radius_km": radius_km,
-            "current_month": datetime.now().month,
-            "current_month_name": datetime.now().strftime("%B"),
+            "current_month": now.month,
+            "current_month_name": now.strftime("%B"),
             "total_seasonal_locations": 0,
             "fruit_types": []
         }
     
     # Get type information
-    all_types = await api_client.get_types()
-    type_names = {t.id: t.name for t in all_types}
-    type_scientific = {t.id: t.scientific_name for t in all_types}
+    type_names, type_scientific = await api_client.get_type_name_maps()
     
-    # Group locations by type
-    by_type = {}
-    for loc in seasonal_locations:
+    # Group locations by type, alongside their distance from the search center
+    by_type: dict[int, list[tuple[FruitLocation, float]]] = defaultdict(list)
+    for loc, distance in seasonal_locations:
         for type_id in loc.type_ids:
-            if type_id not in by_type:
-                by_type[type_id] = []
-            by_type[type_id].append(loc)
+            by_type[type_id].append((loc, distance))
     
     # Format fruit types with their locations
     fruit_types = []
@@ -428,18 +605,16 @@ async def get_seasonal_fruits(location: str, radius_km: int = 10) -> Dict[str, A
         scientific_name = type_scientific.get(type_id, "")
         
         # Get location details for this fruit type
-        type_locations = []
-        for loc in locs:
-            distance = api_client._calculate_distance(lat, lng, loc.lat, loc.lng)
-            maps_link = MapsHelper.generate_maps_link(loc.lat, loc.lng)
-            
-            type_locations.append({
+        type_locations = [
+            {
                 "id": loc.id,
                 "coordinates": {"lat": loc.lat, "lng": loc.lng},
                 "distance_km": round(distance, 1),
                 "description": loc.description,
-                "maps_link": maps_link
-            })
+                "maps_link": MapsHelper.generate_maps_link(loc.lat, loc.lng)
+            }
+            for loc, distance in locs
+        ]
         
         # Sort by distance
         type_locations.sort(key=lambda x: x["distance_km"])
@@ -449,7 +624,7 @@ async def get_seasonal_fruits(location: str, radius_km: int = 10) -> Dict[str, A
             "name": type_name,
             "scientific_name": scientific_name,
             "location_count": len(locs),
-            "closest_distance_km": round(min(loc["distance_km"] for loc in type_locations), 1),
+            "closest_distance_km": type_locations[0]["distance_km"],  # Already sorted and rounded
             "locations": type_locations
         })
     
@@ -461,8 +636,8 @@ async def get_seasonal_fruits(location: str, radius_km: int = 10) -> Dict[str, A
         "location": location,
         "search_center": {"lat": lat, "lng": lng},
         "radius_km": radius_km,
-        "current_month": datetime.now().month,
-        "current_month_name": datetime.now().strftime("%B"),
+        "current_month": now.month,
+        "current_month_name": now.strftime("%B"),
         "total_seasonal_locations": len(seasonal_locations),
         "fruit_types": fruit_types
     }
@@ -478,30 +653,13 @@ async def get_id_for_fruit(fruit_name: str) -> Dict[str, Any]:
     fruit_type = await api_client.find_fruit_type_by_name(fruit_name)
     
     if not fruit_type:
-        # Try to find similar fruits
-        all_types = await api_client.get_all_types()
-        suggestions = []
-        
-        # Find fruits that contain the search term
-        for ft in all_types:
-            all_names = ft.common_names + ft.scientific_names
-            for name in all_names:
-                if fruit_name.lower() in name.lower():
-                    suggestions.append({
-                        "id": ft.id,
-                        "name": name,
-                        "scientific_name": ft.scientific_name
-                    })
-                    if len(suggestions) >= 5:  # Limit suggestions
-                        break
-            if len(suggestions) >= 5:
-                break
-        
+        # find_fruit_type_by_name already falls back to substring matches, so
+        # a miss means no name contains the term and there is nothing to suggest
         return {
             "success": False,
             "query": fruit_name,
             "message": f"No exact match found for '{fruit_name}'",
-            "suggestions": suggestions[:5] if suggestions else [],
+            "suggestions": [],
             "tip": "Try searching with more specific terms like 'red apple' or 'sweet cherry'"
         }
     
@@ -561,8 +719,11 @@ async def get_location_details(location: str, fruit_type: Optional[str] = None,
         fruit_type: Optional specific fruit type to focus on
         radius_km: Search radius in kilometers (default: 5)
     """
-    # Geocode the location
-    geo_result = await LocationHelper.geocode_location(location)
+    # Geocode the location and look up the fruit type concurrently
+    geo_result, types = await asyncio.gather(
+        LocationHelper.geocode_location(location),
+        api_client.get_types(fruit_type) if fruit_type else _no_types()
+    )
     if not geo_result:
         return {
             "success": False,
@@ -576,7 +737,6 @@ async def get_location_details(location: str, fruit_type: Optional[str] = None,
     type_id = None
     fruit_type_info = None
     if fruit_type:
-        types = await api_client.get_types(fruit_type)
         if types:
             type_id = types[0].id
             fruit_type_info = {
@@ -600,18 +760,15 @@ async def get_location_details(location: str, fruit_type: Optional[str] = None,
         }
     
     # Get type information for display
-    all_types = await api_client.get_types()
-    type_names = {t.id: t.name for t in all_types}
-    type_scientific = {t.id: t.scientific_name for t in all_types}
+    type_names, type_scientific = await api_client.get_type_name_maps()
     
-    access_levels = {0: "unknown", 1: "public", 2: "permission_needed", 3: "private"}
+    current_month = datetime.now().month
     
     detailed_locations = []
-    for loc in locations:
-        distance = api_client._calculate_distance(lat, lng, loc.lat, loc.lng)
+    for loc, distance in locations:
         season = SeasonHelper.format_season(loc.season_start, loc.season_stop)
-        access = access_levels.get(loc.access, "unknown")
-        in_season = SeasonHelper.is_in_season(loc.season_start, loc.season_stop)
+        access = _ACCESS_LEVELS[loc.access] if 0 <= loc.access < len(_ACCESS_LEVELS) else "unknown"
+        in_season = SeasonHelper.is_in_season(loc.season_start, loc.season_stop, current_month)
         
         # Get fruit types for this location
         fruits = []